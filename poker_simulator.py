@@ -15,10 +15,11 @@ Requirements: Python ≥ 3.8, no external libs.
 from __future__ import annotations
 
 import argparse
+import array
 import itertools
 import random
 import sys
-from collections import Counter
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
 # ────────── Card helpers ──────────
@@ -32,94 +33,375 @@ ANSI = {
     "♦": "\033[31m",  # red
     "reset": "\033[0m",
 }
-RANK_VAL: Dict[str, int] = {r: i for i, r in enumerate(RANKS, start=2)}
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
 
 
-def deck() -> List[str]:
-    return [r + s for r in RANKS for s in SUITS]
+def _card_int(card: str) -> int:
+    """Cactus Kev encoding: ``xxxbbbbb bbbbbbbb cdhsrrrr xxpppppp``."""
+    r = RANKS.index(card[0]); s = SUITS.index(card[1])
+    return PRIMES[r] | (r << 8) | (1 << (s + 12)) | (1 << (r + 16))
 
 
-def pc(card: str) -> str:
-    sym = SUIT_SYM[card[1]]
-    return f"{ANSI[sym]}{card[0]}{sym}{ANSI['reset']}"
+CARD_INT: Dict[str, int] = {r + s: _card_int(r + s) for r in RANKS for s in SUITS}
+CARD_STR: Dict[int, str] = {v: k for k, v in CARD_INT.items()}
+DECK: Tuple[int, ...] = tuple(CARD_INT.values())
 
 
-def join(cards: List[str]) -> str:
-    return " ".join(pc(c) for c in cards)
+def deck() -> List[int]:
+    return list(DECK)
 
-# ────────── Hand evaluation (same as before) ──────────
-CATS = [
-    "High Card","One Pair","Two Pair","Trips","Straight","Flush",
-    "Full House","Quads","Straight Flush",
-]
-CAT_SCORE = {n:i for i,n in enumerate(CATS)}
 
+# Coloured text for every card, built once; pc(card) is a plain dict lookup.
+_PC_CACHE: Dict[int, str] = {
+    c: f"{ANSI[SUIT_SYM[s[1]]]}{s[0]}{SUIT_SYM[s[1]]}{ANSI['reset']}" for c, s in CARD_STR.items()
+}
+pc = _PC_CACHE.__getitem__
+
+
+def join(cards: List[int]) -> str:
+    return " ".join(map(_PC_CACHE.__getitem__, cards))
+
+# ────────── Hand evaluation (Cactus Kev) ──────────
+# Ranks run 1 (royal flush) .. 7462 (7‑5‑4‑3‑2 offsuit); smaller is better.
+# FLUSH_TABLE / UNIQUE5_TABLE are indexed by the 13‑bit rank mask, PRODUCT_TABLE
+# by the product of the five rank primes (hands with a paired rank).  The
+# five‑card tables only seed the seven‑card ones below, so the mask tables are
+# packed as 2‑byte arrays; the hot FLUSH7 stays a list, whose reads skip the
+# int boxing an array read pays on every access.
+FLUSH_TABLE = array.array("H", bytes(2 * 8192))
+UNIQUE5_TABLE = array.array("H", bytes(2 * 8192))
+PRODUCT_TABLE: Dict[int, int] = {}
+
+
+def _straight_top(m: int) -> int:
+    """Top rank index of the highest five‑card run in rank mask ``m``, 0 if none."""
+    x = (m << 1) | (m >> 12 & 1)  # ace also plays low
+    run = x & (x >> 1) & (x >> 2) & (x >> 3) & (x >> 4)
+    return run.bit_length() + 2 if run else 0
+
+
+# STRAIGHT_TOP[rank_mask] -> _straight_top(rank_mask); the wheel's top is 3 ("5").
+STRAIGHT_TOP = array.array("b", map(_straight_top, range(8192)))
+
+
+def _build_tables() -> None:
+    desc = range(12, -1, -1)
+    straights = [0x1F << (t - 4) for t in range(12, 3, -1)] + [0x100F]
+    highs = [m for m in (sum(1 << r for r in c) for c in itertools.combinations(desc, 5))
+             if not STRAIGHT_TOP[m]]
+    rank = 1
+
+    def put(table, keys):
+        nonlocal rank
+        for k in keys:
+            table[k] = rank; rank += 1
+
+    P = PRIMES
+    put(FLUSH_TABLE, straights)
+    put(PRODUCT_TABLE, (P[q]**4 * P[k] for q in desc for k in desc if k != q))
+    put(PRODUCT_TABLE, (P[t]**3 * P[p]**2 for t in desc for p in desc if p != t))
+    put(FLUSH_TABLE, highs)
+    put(UNIQUE5_TABLE, straights)
+    put(PRODUCT_TABLE, (P[t]**3 * P[a] * P[b] for t in desc
+                        for a, b in itertools.combinations([r for r in desc if r != t], 2)))
+    put(PRODUCT_TABLE, (P[h]**2 * P[l]**2 * P[k] for h, l in itertools.combinations(desc, 2)
+                        for k in desc if k not in (h, l)))
+    put(PRODUCT_TABLE, (P[p]**2 * P[a] * P[b] * P[c] for p in desc
+                        for a, b, c in itertools.combinations([r for r in desc if r != p], 3)))
+    put(UNIQUE5_TABLE, highs)
+
+
+_build_tables()
+
+# ────────── 7‑card evaluator ──────────
+# FLUSH7 maps the flush suit's rank mask (5–7 bits) to its best rank, NOFLUSH7
+# maps the product of all seven rank primes to the best non‑flush rank.  A
+# seven‑card hand with five of a suit can never hold quads or a full house, so
+# one lookup is always the final answer.
+FLUSH7: List[int] = [0] * 8192
+NOFLUSH7: Dict[int, int] = {}
+_SUIT_NIBBLE: Dict[int, int] = {c: 1 << 4 * ((c >> 12 & 0xF).bit_length() - 1) for c in DECK}
+
+
+def _build_tables7() -> None:
+    for n in (5, 6, 7):
+        for combo in itertools.combinations(range(13), n):
+            m = sum(1 << r for r in combo)
+            top = STRAIGHT_TOP[m]
+            if top:
+                FLUSH7[m] = FLUSH_TABLE[0x1F << (top - 4) if top >= 4 else 0x100F]
+                continue
+            for _ in range(n - 5):
+                m &= m - 1  # drop the lowest rank
+            FLUSH7[sum(1 << r for r in combo)] = FLUSH_TABLE[m]
+    best = {PRIMES[a] * PRIMES[b] * PRIMES[c] * PRIMES[d] * PRIMES[e]: UNIQUE5_TABLE[
+        (1 << a) | (1 << b) | (1 << c) | (1 << d) | (1 << e)] for a, b, c, d, e in itertools.combinations(range(13), 5)}
+    best.update(PRODUCT_TABLE)
+    for n in (6, 7):
+        nxt: Dict[int, int] = {}
+        for combo in itertools.combinations_with_replacement(range(13), n):
+            if any(combo[i] == combo[i + 4] for i in range(n - 4)):  # five of a rank
+                continue
+            p = 1
+            for r in combo:
+                p *= PRIMES[r]
+            nxt[p] = min(best[p // PRIMES[r]] for r in set(combo))
+        best = nxt
+    NOFLUSH7.update(best)
+
+
+_build_tables7()
+
+
+def _flush7(flush: int, cards7: List[int]) -> int:
+    """Rank of a flush hand; ``flush`` is the masked suit‑nibble sum."""
+    suit = 0x1000 << (flush.bit_length() - 3) // 4
+    m = 0
+    for c in cards7:
+        if c & suit:
+            m |= c >> 16
+    return FLUSH7[m]
+
+
+def best7(cards7: List[int]) -> int:
+    c0, c1, c2, c3, c4, c5, c6 = cards7
+    s = (_SUIT_NIBBLE[c0] + _SUIT_NIBBLE[c1] + _SUIT_NIBBLE[c2] + _SUIT_NIBBLE[c3]
+         + _SUIT_NIBBLE[c4] + _SUIT_NIBBLE[c5] + _SUIT_NIBBLE[c6])
+    flush = s & ((s << 1) | (s << 2)) & 0x4444  # nibble count >= 5
+    if flush:
+        return _flush7(flush, cards7)
+    return NOFLUSH7[(c0 & 0xFF) * (c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF)
+                    * (c4 & 0xFF) * (c5 & 0xFF) * (c6 & 0xFF)]
 
-def _is_straight(vals: List[int]) -> Tuple[bool,int]:
-    vals=sorted(set(vals),reverse=True)
-    if {14,5,4,3,2}.issubset(vals):
-        return True,5
-    for i in range(len(vals)-4):
-        if vals[i]-vals[i+4]==4:
-            return True, vals[i]
-    return False,0
-
+# ────────── Equity ──────────
 
-def _rank5(cards: Tuple[str,...]) -> Tuple[int,List[int]]:
-    vals=sorted((RANK_VAL[c[0]] for c in cards),reverse=True)
-    suits=[c[1] for c in cards]
-    cnt=Counter(vals).most_common()
-    flush=len(set(suits))==1
-    straight,top=_is_straight(vals)
-    if flush and straight:
-        return CAT_SCORE["Straight Flush"],[top]
-    if cnt[0][1]==4:
-        quad=cnt[0][0]; kicker=max(v for v in vals if v!=quad)
-        return CAT_SCORE["Quads"],[quad,kicker]
-    if cnt[0][1]==3 and cnt[1][1]==2:
-        return CAT_SCORE["Full House"],[cnt[0][0],cnt[1][0]]
-    if flush:
-        return CAT_SCORE["Flush"],vals
-    if straight:
-        return CAT_SCORE["Straight"],[top]
-    if cnt[0][1]==3:
-        trips=cnt[0][0]; kick=[v for v in vals if v!=trips][:2]
-        return CAT_SCORE["Trips"],[trips]+kick
-    if cnt[0][1]==2 and cnt[1][1]==2:
-        high,low=max(cnt[0][0],cnt[1][0]),min(cnt[0][0],cnt[1][0])
-        kicker=max(v for v in vals if v not in (high,low))
-        return CAT_SCORE["Two Pair"],[high,low,kicker]
-    if cnt[0][1]==2:
-        pair=cnt[0][0]; kick=[v for v in vals if v!=pair][:3]
-        return CAT_SCORE["One Pair"],[pair]+kick
-    return CAT_SCORE["High Card"],vals
-
-
-def best7(cards7: List[str]) -> Tuple[int,List[int]]:
-    return max(_rank5(c) for c in itertools.combinations(cards7,5))
-
-# ────────── Equity (unchanged) ──────────
-
-def equity(player: List[str], board: List[str], opp_n:int, sims:int) -> Tuple[float,float,float]:
+_KERNEL_SRC = """\
+def kernel(player, board, sims, r):
     wins=ties=0
-    mast=deck()
-    for c in player+board:
-        mast.remove(c)
+    s_board=0; p_board=1
+    for c in board: s_board+=SN[c]; p_board*=c&0xFF
+    p0,p1=player
+    s_hero=SN[p0]+SN[p1]; p_hero=(p0&0xFF)*(p1&0xFF)
+    for _ in range(sims):
+{deal}
+        s_comm=s_board+{comm_s}; p_comm=p_board*{comm_p}
+        s=s_comm+s_hero; flush=s&((s<<1)|(s<<2))&0x4444
+        pr=_flush7(flush,player+board+[{comm}]) if flush else NF[p_comm*p_hero]
+{opps}
+        best_opp={best_opp}
+        if pr<best_opp: wins+=1
+        elif pr==best_opp: ties+=1
+    return wins,ties
+"""
+
+
+@lru_cache(maxsize=None)
+def _compile_kernel(n_comm:int, opp_n:int, n_rem:int):
+    """Monte‑Carlo loop specialised for one deal shape, built with ``exec``.
+
+    Each sim partially Fisher–Yates shuffles the unseen cards in place, one
+    unrolled swap per dealt slot with its pick range baked in.  Swaps are not
+    undone: a partial shuffle of any arrangement deals a uniform sample.  The
+    community cards' suit‑nibble sum and prime product are shared by every
+    hand; each hand only folds in its two hole cards before the lookup.
+    """
+    need=n_comm+opp_n*2
+    deal="\n".join(f"        j={i}+int(rnd()*{n_rem-i}); d{i}=r[j]; r[j]=r[{i}]; r[{i}]=d{i}"
+                   for i in range(need))
+    comm=[f"d{i}" for i in range(n_comm)]
+    opps=[]
+    for o in range(opp_n):
+        a=f"d{n_comm+2*o}"; b=f"d{n_comm+2*o+1}"
+        opps.append(f"        s=s_comm+SN[{a}]+SN[{b}]; flush=s&((s<<1)|(s<<2))&0x4444\n"
+                    f"        o{o}=_flush7(flush,[{a},{b}]+board+[{','.join(comm)}]) if flush "
+                    f"else NF[p_comm*({a}&0xFF)*({b}&0xFF)]")
+    src=_KERNEL_SRC.format(
+        deal=deal, comm=",".join(comm),
+        comm_s="+".join(f"SN[{c}]" for c in comm) or "0",
+        comm_p="*".join(f"({c}&0xFF)" for c in comm) or "1",
+        opps="\n".join(opps),
+        best_opp=f"min({','.join(f'o{o}' for o in range(opp_n))})" if opp_n>1 else "o0" if opp_n else "7463")
+    g={"rnd":random.random,"SN":_SUIT_NIBBLE,"NF":NOFLUSH7,"_flush7":_flush7}
+    exec(compile(src,f"<equity_kernel {n_comm}/{opp_n}/{n_rem}>","exec"),g)
+    return g["kernel"]
+
+
+def _equity_kernel(player: List[int], board: List[int], opp_n:int, sims:int,
+                   remaining: List[int]) -> Tuple[int,int]:
+    """Monte‑Carlo core of :func:`equity`; returns ``(wins, ties)``."""
+    kernel=_compile_kernel(5-len(board),opp_n,len(remaining))
+    return kernel(player,board,sims,remaining)
+
+
+def _disjoint_pairs(pairs: List[Tuple[int,int]], k:int) -> int:
+    """Ways to pick ``k`` ≤ 3 pairwise card‑disjoint hole pairs from ``pairs``.
+
+    Inclusion–exclusion over the graph whose edges are the pairs: from all
+    k‑subsets remove those sharing a card (two‑edge paths, three‑edge paths,
+    stars and triangles).
+    """
+    m=len(pairs)
+    if k<=1:
+        return m if k else 1
+    adj: Dict[int,int] = {}  # card -> bitmask of its partners
+    bit: Dict[int,int] = {}
+    for a,b in pairs:
+        ba=bit.setdefault(a,1<<len(bit)); bb=bit.setdefault(b,1<<len(bit))
+        adj[a]=adj.get(a,0)|bb; adj[b]=adj.get(b,0)|ba
+    deg={c:bin(v).count("1") for c,v in adj.items()}
+    paths2=sum(d*(d-1)//2 for d in deg.values())
+    if k==2:
+        return m*(m-1)//2-paths2
+    stars=sum(d*(d-1)*(d-2)//6 for d in deg.values())
+    tri=sum(bin(adj[a]&adj[b]).count("1") for a,b in pairs)//3
+    paths3=sum((deg[a]-1)*(deg[b]-1) for a,b in pairs)-3*tri
+    return m*(m-1)*(m-2)//6-paths2*(m-2)+paths3+2*stars+2*tri
+
+
+@lru_cache(maxsize=128)
+def _river_counts(player: Tuple[int,...], board: Tuple[int,...], opp_n:int) -> Tuple[int,int,int]:
+    """Exact ``(wins, ties, deals)`` on a full board over every opponent deal.
+
+    Each of the C(n,2) unseen hole pairs is ranked once; a win is a deal whose
+    ``opp_n`` holes all lose to the player, a tie one where none beats them.
+    Callers pass sorted tuples so the river street reuses the boards already
+    counted while enumerating the turn; hits across unrelated hands are rare,
+    so the cache only needs to hold a couple of turns' 46 rivers.
+    """
+    known=set(player+board)
+    remaining=[c for c in DECK if c not in known]
+    board=list(board)
+    pr=best7(list(player)+board)
+    SN=_SUIT_NIBBLE; NF=NOFLUSH7
+    s_board=sum(SN[c] for c in board); p_board=1
+    for c in board: p_board*=c&0xFF
+    lose=[]; split=[]
+    for i,a in enumerate(remaining):
+        # only the right‑hand card advances in the inner loop, so fold the
+        # left one into the board partials once
+        s_a=s_board+SN[a]; p_a=p_board*(a&0xFF)
+        for b in remaining[i+1:]:
+            s=s_a+SN[b]
+            flush=s&((s<<1)|(s<<2))&0x4444
+            r=_flush7(flush,[a,b]+board) if flush else NF[p_a*(b&0xFF)]
+            if r>pr: lose.append((a,b))
+            elif r==pr: split.append((a,b))
+    wins=_disjoint_pairs(lose,opp_n)
+    ties=_disjoint_pairs(lose+split,opp_n)-wins
+    deals=1
+    for i in range(opp_n):
+        deals*=(len(remaining)-2*i)*(len(remaining)-2*i-1)//2
+    for i in range(2,opp_n+1):
+        deals//=i
+    return wins,ties,deals
+
+
+# Pre‑flop win/tie % against 3 random opponents for the 169 starting‑hand
+# classes, 200 000 sims each through the Monte‑Carlo kernel above.  Regenerate
+# with one representative pair per class:
+#
+#   table = {}
+#   for pair in itertools.combinations(DECK, 2):
+#       cls = hand_class(list(pair))
+#       if cls not in table:
+#           remaining = [c for c in DECK if c not in pair]
+#           wins, ties = _equity_kernel(list(pair), [], 3, 200_000, remaining)
+#           table[cls] = (round(wins / 2000, 2), round(ties / 2000, 2))
+PREFLOP_EQUITY: Dict[str, Tuple[float,float]] = {
+    "AA":(63.69,0.6), "AKs":(40.54,2.01), "AKo":(37.34,2.1), "AQs":(38.66,2.23), "AQo":(35.71,2.43), "AJs":(37.41,2.62),
+    "AJo":(34.0,2.62), "ATs":(35.95,2.86), "ATo":(32.6,2.94), "A9s":(33.12,3.1), "A9o":(29.63,3.27), "A8s":(31.89,3.44),
+    "A8o":(28.25,3.58), "A7s":(30.73,3.65), "A7o":(26.86,3.84), "A6s":(29.43,3.82), "A6o":(25.75,3.98), "A5s":(29.8,4.05),
+    "A5o":(26.12,4.23), "A4s":(29.07,3.99), "A4o":(25.37,4.21), "A3s":(28.28,3.97), "A3o":(24.44,4.11), "A2s":(27.64,3.78),
+    "A2o":(23.82,3.97),
+    "KK":(58.21,0.63), "KQs":(37.16,2.21), "KQo":(34.08,2.25), "KJs":(35.75,2.54), "KJo":(32.54,2.56), "KTs":(34.52,2.73),
+    "KTo":(31.33,2.84), "K9s":(31.59,2.93), "K9o":(28.05,3.05), "K8s":(29.28,3.19), "K8o":(25.63,3.24), "K7s":(28.3,3.45),
+    "K7o":(24.56,3.64), "K6s":(27.42,3.59), "K6o":(23.52,3.75), "K5s":(26.52,3.63), "K5o":(22.58,3.9), "K4s":(25.94,3.65),
+    "K4o":(21.73,3.84), "K3s":(25.3,3.58), "K3o":(21.28,3.61), "K2s":(24.58,3.4), "K2o":(20.44,3.64),
+    "QQ":(53.3,0.68), "QJs":(34.69,2.45), "QJo":(31.39,2.6), "QTs":(33.29,2.77), "QTo":(29.9,2.84), "Q9s":(30.58,2.89),
+    "Q9o":(27.04,2.94), "Q8s":(28.36,3.07), "Q8o":(24.8,3.16), "Q7s":(26.19,3.18), "Q7o":(22.34,3.43), "Q6s":(25.51,3.43),
+    "Q6o":(21.6,3.62), "Q5s":(24.65,3.49), "Q5o":(20.61,3.65), "Q4s":(24.0,3.46), "Q4o":(20.0,3.56), "Q3s":(23.35,3.35),
+    "Q3o":(19.15,3.47), "Q2s":(23.0,3.2), "Q2o":(18.53,3.45),
+    "JJ":(48.89,0.76), "JTs":(32.58,2.71), "JTo":(29.34,2.89), "J9s":(29.86,2.76), "J9o":(26.62,2.94), "J8s":(27.66,3.02),
+    "J8o":(24.14,3.1), "J7s":(25.9,3.15), "J7o":(21.97,3.25), "J6s":(23.71,3.17), "J6o":(19.84,3.35), "J5s":(23.0,3.38),
+    "J5o":(19.26,3.57), "J4s":(22.52,3.3), "J4o":(18.51,3.46), "J3s":(21.79,3.13), "J3o":(17.75,3.31), "J2s":(21.37,3.14),
+    "J2o":(17.11,3.25),
+    "TT":(44.87,0.82), "T9s":(29.6,2.94), "T9o":(26.39,2.89), "T8s":(27.54,3.0), "T8o":(24.08,3.18), "T7s":(25.4,3.1),
+    "T7o":(21.8,3.25), "T6s":(23.51,3.25), "T6o":(19.64,3.41), "T5s":(21.85,3.24), "T5o":(17.73,3.4), "T4s":(21.29,3.2),
+    "T4o":(17.37,3.37), "T3s":(20.67,3.13), "T3o":(16.46,3.27), "T2s":(20.22,3.03), "T2o":(15.9,3.12),
+    "99":(40.84,0.81), "98s":(27.27,2.89), "98o":(23.61,2.98), "97s":(25.09,3.03), "97o":(21.69,3.13), "96s":(23.5,2.97),
+    "96o":(19.54,3.18), "95s":(21.46,3.15), "95o":(17.77,3.25), "94s":(20.18,3.06), "94o":(15.83,3.19), "93s":(19.56,3.04),
+    "93o":(15.41,3.07), "92s":(19.04,2.88), "92o":(14.77,2.97),
+    "88":(37.27,0.83), "87s":(25.31,3.0), "87o":(21.59,3.12), "86s":(23.58,2.95), "86o":(19.93,3.14), "85s":(21.98,3.02),
+    "85o":(17.87,3.14), "84s":(20.2,2.98), "84o":(16.18,3.15), "83s":(18.59,2.84), "83o":(14.45,2.96), "82s":(18.16,2.79),
+    "82o":(13.93,2.87),
+    "77":(34.05,0.86), "76s":(23.71,3.04), "76o":(20.07,3.09), "75s":(22.21,3.07), "75o":(18.39,3.08), "74s":(20.46,2.89),
+    "74o":(16.25,2.99), "73s":(18.79,2.81), "73o":(14.75,2.93), "72s":(17.35,2.64), "72o":(13.13,2.82),
+    "66":(31.07,0.86), "65s":(22.38,2.98), "65o":(18.67,3.1), "64s":(20.98,2.82), "64o":(16.96,3.0), "63s":(19.24,2.71),
+    "63o":(15.26,2.79), "62s":(17.78,2.59), "62o":(13.5,2.7),
+    "55":(28.41,0.94), "54s":(21.2,3.03), "54o":(17.42,3.03), "53s":(20.06,2.83), "53o":(15.92,2.92), "52s":(18.49,2.67),
+    "52o":(14.24,2.81),
+    "44":(26.0,0.92), "43s":(19.3,2.66), "43o":(15.36,2.78), "42s":(17.83,2.47), "42o":(13.84,2.66),
+    "33":(23.64,0.85), "32s":(17.13,2.35), "32o":(12.94,2.47),
+    "22":(21.66,0.84),
+}
+
+
+def hand_class(player: List[int]) -> str:
+    """Starting‑hand class such as ``"AKs"``, ``"T9o"`` or ``"77"``."""
+    hi,lo=sorted(player,key=lambda c:c>>8&0xF,reverse=True)
+    a=RANKS[hi>>8&0xF]; b=RANKS[lo>>8&0xF]
+    if a==b:
+        return a+b
+    return a+b+("s" if hi&lo&0xF000 else "o")
+
+
+# One card -> card map per suit permutation, so canonicalize() relabels with
+# plain dict lookups.
+_RELABEL: Tuple[Dict[int,int],...] = tuple(
+    {c: c&~0xF000|1<<(perm[(c>>12&0xF).bit_length()-1]+12) for c in DECK}
+    for perm in itertools.permutations(range(4)))
+
+
+def canonicalize(player: List[int], board: List[int]) -> Tuple[Tuple[int,...],Tuple[int,...]]:
+    """Smallest suit relabelling of ``(player, board)``, each side sorted.
+
+    Suits are interchangeable, so every hand mapping to the same key has the
+    same equity; pre‑flop this collapses 1 326 holdings to 169 keys.
+    """
+    best=None
+    for tbl in _RELABEL:
+        get=tbl.__getitem__
+        key=(tuple(sorted(map(get,player))),tuple(sorted(map(get,board))))
+        if best is None or key<best:
+            best=key
+    return best
+
+
+@lru_cache(maxsize=100_000)
+def _equity_cached(player: Tuple[int,...], board: Tuple[int,...], opp_n:int, sims:int) -> Tuple[float,float,float]:
+    known=set(player+board)
+    remaining=[c for c in DECK if c not in known]
     need=(5-len(board))+opp_n*2
-    if need>len(mast):
+    if need>len(remaining):
         return 0,0,100
-    for _ in range(sims):
-        d=mast.copy(); random.shuffle(d)
-        comm=board+[d.pop() for _ in range(5-len(board))]
-        opps=[[d.pop(),d.pop()] for _ in range(opp_n)]
-        pr=best7(player+comm)
-        opp_rs=[best7(o+comm) for o in opps]
-        best=max([pr]+opp_rs)
-        if pr==best:
-            if opp_rs.count(best)==0:wins+=1
-            else:ties+=1
+    if len(board)>=4 and opp_n<=3:
+        # Turn/river: enumerate every river card and opponent deal exactly.
+        wins=ties=sims=0
+        for river in (remaining if len(board)==4 else [None]):
+            comm=board if river is None else board+(river,)
+            w,t,n=_river_counts(player,tuple(sorted(comm)),opp_n)
+            wins+=w; ties+=t; sims+=n
+    else:
+        wins,ties=_equity_kernel(list(player),list(board),opp_n,sims,remaining)
     return wins*100/sims, ties*100/sims, (sims-wins-ties)*100/sims
 
+
+def equity(player: List[int], board: List[int], opp_n:int, sims:int) -> Tuple[float,float,float]:
+    if not board and opp_n==3:
+        win,tie=PREFLOP_EQUITY[hand_class(player)]
+        return win,tie,round(100-win-tie,2)
+    return _equity_cached(*canonicalize(player,board),opp_n,sims)
+
 # ────────── Gameplay helpers ──────────
 
 def suggest(win:float)->str:
@@ -152,21 +434,23 @@ def play_hand(interactive:bool, sims:int, stacks:List[int]) -> None:
     stacks[2]-=BIG_BLIND;   pot+=BIG_BLIND
     current_bet=BIG_BLIND
 
-    board:List[str]=[]
+    board:List[int]=[]
     stage={0:"Pre‑flop",3:"Flop",4:"Turn",5:"River"}
     active=[True,True,True,True]  # you + 3 opps (we only allow you to act)
 
     while True:
         win,tie,lose=equity(player,board,3,sims)
-        print("\n"+"="*60)
-        print(f"*** {stage[len(board)]}  |  Pot: {pot}  |  Your stack: {stacks[0]}")
-        print("Your hand :",join(player))
-        print("Board     :",join(board) if board else "--")
-        print(f"Win/Tie/Lose: {win:5.1f}% | {tie:4.1f}% | {lose:5.1f}%  | Suggested: {suggest(win)}")
+        # one write per street frame instead of a print() per line
+        buf=["","="*60,
+             f"*** {stage[len(board)]}  |  Pot: {pot}  |  Your stack: {stacks[0]}",
+             f"Your hand : {join(player)}",
+             f"Board     : {join(board) if board else '--'}",
+             f"Win/Tie/Lose: {win:5.1f}% | {tie:4.1f}% | {lose:5.1f}%  | Suggested: {suggest(win)}"]
 
         to_call=current_bet
         move=""
         if interactive:
+            sys.stdout.write("\n".join(buf)+"\n"); buf=[]
             try:
                 prompt=f"Your move (fold/call{'/check' if to_call==0 else ''}/raise): "
                 move=input(prompt).strip().lower()
@@ -174,11 +458,14 @@ def play_hand(interactive:bool, sims:int, stacks:List[int]) -> None:
                 interactive=False
         if not interactive:
             move=auto_decision(win,len(board),to_call)
-            print(f"[AUTO] {move.upper()}")
+            buf.append(f"[AUTO] {move.upper()}")
         if move=="fold":
             active[0]=False
-            print("🚪 You folded – hand over.")
+            buf.append("🚪 You folded – hand over.")
+            sys.stdout.write("\n".join(buf)+"\n")
             return
+        if buf:
+            sys.stdout.write("\n".join(buf)+"\n")
         if move in ("call","check"):
             call_amt=to_call if to_call>0 else 0
             stacks[0]-=call_amt; pot+=call_amt
@@ -207,19 +494,17 @@ def play_hand(interactive:bool, sims:int, stacks:List[int]) -> None:
     pr=best7(player+board)
     opp_rs=[best7(o+board) for o in opps]
     everyone=[("You",pr,0)]+[(f"Opp {i+1}",r,i+1) for i,r in enumerate(opp_rs)]
-    best=max(r for _,r,_ in everyone)
+    best=min(r for _,r,_ in everyone)
     winners=[idx for name,r,idx in everyone if r==best]
     share=pot//len(winners)
     for idx in winners:
         stacks[idx]+=share
-    print("\n*** Showdown ***")
-    print("Board    :",join(board))
-    print("You      :",join(player))
-    for i,o in enumerate(opps,1):
-        print(f"Opp {i}  :",join(o))
     names=["You"]+ [f"Opp {i}" for i in range(1,4)]
-    print("\nResult   :",", ".join(names[i] for i in winners),"win" if len(winners)==1 else "split pot")
-    print("Pot paid :",share,"each  |  Your new stack:",stacks[0])
+    buf=["","*** Showdown ***",f"Board    : {join(board)}",f"You      : {join(player)}"]
+    buf+=[f"Opp {i}  : {join(o)}" for i,o in enumerate(opps,1)]
+    buf+=["",f"Result   : {', '.join(names[i] for i in winners)} {'win' if len(winners)==1 else 'split pot'}",
+          f"Pot paid : {share} each  |  Your new stack: {stacks[0]}"]
+    sys.stdout.write("\n".join(buf)+"\n")
 
 # ────────── Main loop ──────────
 